@@ -0,0 +1,15 @@
+"""
+Minimal edge runtime: load a serialized policy and make green-time decisions
+without pandas. Standard library only; NumPy is used lazily if present.
+
+    python -m edge_runtime run --policy policy.json --input traffic.csv
+"""
+
+from .policy import FuzzyPolicy, QTablePolicy, ThresholdPolicy, load_policy, save_policy
+from .reader import aggregate_rows, iter_records, iter_states, normalize_record
+
+__all__ = [
+    "ThresholdPolicy", "QTablePolicy", "FuzzyPolicy",
+    "load_policy", "save_policy", "iter_records", "iter_states", "aggregate_rows",
+    "normalize_record",
+]
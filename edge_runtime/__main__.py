@@ -0,0 +1,104 @@
+"""
+Usage:
+    python -m edge_runtime run --policy policy.json --input traffic.csv
+    python -m edge_runtime run --derive traffic_sim --input traffic.csv
+    python -m edge_runtime export-threshold --output policy.json
+    python -m edge_runtime export-qtable --policy-csv qlearning_state_policy.csv --plan qlearning_signal_plan.csv --output policy.json
+    python -m edge_runtime export-fuzzy --plan fuzzy_signal_plan.csv --output policy.json
+    python -m edge_runtime bench --input traffic.csv [--policy policy.json] [--derive traffic_sim]
+
+None of the commands need pandas or numpy.
+"""
+
+import argparse
+
+from .policy import FuzzyPolicy, QTablePolicy, ThresholdPolicy, load_policy, save_policy
+from .reader import DERIVATIONS, iter_records, iter_states
+
+
+def plan_bounds(plan_path):
+    # Normalization bounds the offline controllers computed over the whole dataset
+    cnt, spd = [], []
+    for rec in iter_states(plan_path):
+        cnt.append(rec["vehicle_count"])
+        spd.append(rec["avg_speed"])
+    if not cnt:
+        raise ValueError(f"No rows in {plan_path}")
+    return [min(cnt), max(cnt)], [min(spd), max(spd)]
+
+
+def positive_int(value):
+    n = int(value)
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return n
+
+
+def run(policy_path, input_path, fmt=None, bin_seconds=10, derive="simulator"):
+    policy = load_policy(policy_path) if policy_path else ThresholdPolicy()
+    if policy.kind == "threshold":
+        records = iter_records(input_path, fmt, derive)
+    else:
+        records = iter_states(input_path, fmt, bin_seconds)
+    for rec in records:
+        duration = policy.decide(rec)
+        if policy.kind == "threshold":
+            print(f"[{rec['timestamp']}] Edge: Green light {duration}s "
+                  f"(queue={rec['queue']}, density={rec['density']}, "
+                  f"occupancy={rec['occupancy']}, speed={rec['speed']})")
+        else:
+            print(f"[{rec['timestamp']}] Edge: Green light {duration}s "
+                  f"(intersection={rec.get('intersection_id', '-')}, vehicle_count={rec['vehicle_count']}, "
+                  f"avg_speed={rec['avg_speed']}, current_green={rec['current_green']})")
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m edge_runtime")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("run", help="stream records and print green-time decisions")
+    p.add_argument("--policy", default="", help="policy JSON (default: built-in TrafficPredictor thresholds)")
+    p.add_argument("--input", default="-", help="CSV or JSON-lines file, '-' for stdin")
+    p.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    p.add_argument("--bin", type=positive_int, default=10, help="aggregation bin size in seconds for qtable/fuzzy (default 10)")
+    p.add_argument("--derive", choices=DERIVATIONS, default="simulator",
+                   help="derive threshold inputs like simulator.py or traffic_sim.py (default simulator)")
+
+    p = sub.add_parser("export-threshold", help="write the TrafficPredictor policy")
+    p.add_argument("--output", required=True)
+
+    p = sub.add_parser("export-qtable", help="convert a Q-learning state policy CSV")
+    p.add_argument("--policy-csv", required=True)
+    p.add_argument("--plan", required=True, help="signal plan CSV used for normalization bounds")
+    p.add_argument("--output", required=True)
+
+    p = sub.add_parser("export-fuzzy", help="write the fuzzy controller's sets and rules")
+    p.add_argument("--plan", required=True, help="signal plan CSV used for normalization bounds")
+    p.add_argument("--output", required=True)
+
+    p = sub.add_parser("bench", help="compare cold start and RSS with the simulator entry points")
+    p.add_argument("--input", required=True)
+    p.add_argument("--policy", default="")
+    p.add_argument("--repeat", type=positive_int, default=5)
+    p.add_argument("--derive", choices=DERIVATIONS, default="simulator")
+
+    args = ap.parse_args()
+    if args.cmd == "run":
+        run(args.policy, args.input, args.format, args.bin, args.derive)
+    elif args.cmd == "export-threshold":
+        save_policy(ThresholdPolicy(), args.output)
+    elif args.cmd == "export-qtable":
+        policy = QTablePolicy.from_policy_csv(args.policy_csv, *plan_bounds(args.plan))
+        save_policy(policy, args.output)
+    elif args.cmd == "export-fuzzy":
+        policy = FuzzyPolicy(*plan_bounds(args.plan))
+        save_policy(policy, args.output)
+    elif args.cmd == "bench":
+        from .bench import main as bench_main
+        bench_main(args.input, args.policy, args.repeat, args.derive)
+    if args.cmd.startswith("export"):
+        print(f"Policy saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
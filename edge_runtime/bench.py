@@ -0,0 +1,99 @@
+"""
+Cold-start benchmark: edge runtime vs the existing simulator entry points.
+
+Each case runs in a fresh interpreter and measures wall time until the first
+green-time decision plus the child's peak RSS (Unix only; "n/a" elsewhere).
+
+    python -m edge_runtime bench --input traffic.csv --policy policy.json
+
+With a threshold policy, edge_runtime makes the decisions of the entry point
+picked with --derive; with a qtable/fuzzy policy it runs a different decision
+rule, and the simulator rows are only a cold-start baseline.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from .policy import ThresholdPolicy, load_policy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Appended to every case: the child reports its own peak RSS in KiB
+RSS_PROBE = """
+try:
+    import resource, sys as _s
+    _r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("RSS_KB", _r // 1024 if _s.platform == "darwin" else _r)
+except ImportError:
+    print("RSS_KB", -1)
+"""
+
+
+def cases(input_path, policy_path, derive="simulator"):
+    inp, pol, der = repr(input_path), repr(policy_path), repr(derive)
+    return {
+        # main.py / simulator.py: read_csv + derive_metrics on the first row
+        "simulator.py": (
+            "from simulator import TrafficSimulator\n"
+            "from predictor import TrafficPredictor\n"
+            f"sim = TrafficSimulator({inp})\n"
+            "row = sim.data.iloc[0]\n"
+            "TrafficPredictor.predict_duration(*sim.derive_metrics(row))\n"
+        ),
+        # traffic_sim.py: chunked read_csv, first chunk only
+        "traffic_sim.py": (
+            "import pandas as pd\n"
+            "import traffic_sim\n"
+            "sim = traffic_sim.TrafficSimulator()\n"
+            f"row = next(iter(pd.read_csv({inp}, chunksize=1))).iloc[0]\n"
+            "sim.predict_duration(*sim.derive_metrics(row))\n"
+        ),
+        "edge_runtime": (
+            "from edge_runtime import iter_records, iter_states, load_policy, ThresholdPolicy\n"
+            f"policy = load_policy({pol}) if {pol} else ThresholdPolicy()\n"
+            "if policy.kind == 'threshold':\n"
+            f"    rec = next(iter_records({inp}, derive={der}))\n"
+            "else:\n"
+            f"    rec = next(iter_states({inp}))\n"
+            "policy.decide(rec)\n"
+        ),
+    }
+
+
+def run_case(code):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code + RSS_PROBE], cwd=ROOT,
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        err = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+        return None, None, err
+    rss = next((int(line.split()[1]) for line in proc.stdout.splitlines()
+                if line.startswith("RSS_KB")), -1)
+    return elapsed, rss, None
+
+
+def main(input_path, policy_path="", repeat=5, derive="simulator"):
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+    policy = load_policy(policy_path) if policy_path else ThresholdPolicy()
+    if policy.kind == "threshold":
+        print(f"edge_runtime reproduces {derive}.py decisions (--derive {derive}); "
+              "the other simulator row is a cold-start baseline only")
+    else:
+        print(f"edge_runtime runs the {policy.kind} policy on binned states; "
+              "the simulator rows are a cold-start baseline only")
+    print(f"{'entry point':<16}{'cold start (ms)':>18}{'peak RSS (MB)':>16}")
+    policy_path = policy_path and os.path.abspath(policy_path)
+    for name, code in cases(os.path.abspath(input_path), policy_path, derive).items():
+        results = [run_case(code) for _ in range(repeat)]
+        errors = [e for _, _, e in results if e]
+        if errors:
+            print(f"{name:<16}  error: {errors[0]}")
+            continue
+        best = min(t for t, _, _ in results) * 1000
+        rss = max(r for _, r, _ in results)
+        rss_txt = f"{rss / 1024:.1f}" if rss >= 0 else "n/a"
+        print(f"{name:<16}{best:>18.1f}{rss_txt:>16}")
@@ -0,0 +1,204 @@
+"""
+Serialized green-time policies for the edge runtime.
+
+A policy file is a small JSON document with a "kind" field:
+
+    threshold -> TrafficPredictor weights and score thresholds
+    qtable    -> best delta per (dens_lvl, spd_lvl) from qlearning_traffic_controller.py
+    fuzzy     -> membership sets and rules of fuzzy_traffic_controller.fuzzy_controller
+
+Only the standard library is used here so that loading a policy stays cheap.
+"""
+
+import csv
+import json
+
+MIN_GREEN = 5
+DEFAULT_GREEN = 10
+
+
+def _normalize(x, lo, hi):
+    # Same min-max scaling as compute_congestion, with bounds fixed at export time
+    n = (x - lo) / (hi - lo + 1e-9)
+    return min(max(n, 0.0), 1.0)
+
+
+def _level(x):
+    # Same bins as discretize() in qlearning_traffic_controller.py
+    if x < 0.33:
+        return 0
+    if x < 0.67:
+        return 1
+    return 2
+
+
+class ThresholdPolicy:
+    """Linear score + thresholds, equivalent to TrafficPredictor.predict_duration."""
+
+    kind = "threshold"
+
+    def __init__(self, weights=None, thresholds=None):
+        self.weights = weights or {"queue": 0.6, "density": 2.0, "occupancy": 0.1, "speed": -0.3}
+        # (score above which, green seconds), checked top-down
+        self.thresholds = thresholds or [[15, 40], [10, 30], [5, 20]]
+        self.default = DEFAULT_GREEN
+
+    def predict_duration(self, queue, density, occupancy, speed):
+        w = self.weights
+        score = w["queue"] * queue + w["density"] * density + w["occupancy"] * occupancy + w["speed"] * (speed / 3.6)
+        for limit, green in self.thresholds:
+            if score > limit:
+                return green
+        return self.default
+
+    def decide(self, rec):
+        return self.predict_duration(rec["queue"], rec["density"], rec["occupancy"], rec["speed"])
+
+    def predict_batch(self, queue, density, occupancy, speed):
+        """Vectorized predict_duration over equal-length sequences; uses NumPy if installed."""
+        try:
+            import numpy as np
+        except ImportError:
+            return [self.predict_duration(*m) for m in zip(queue, density, occupancy, speed)]
+        w = self.weights
+        score = (w["queue"] * np.asarray(queue, dtype=float) + w["density"] * np.asarray(density, dtype=float)
+                 + w["occupancy"] * np.asarray(occupancy, dtype=float)
+                 + w["speed"] * (np.asarray(speed, dtype=float) / 3.6))
+        conds = [score > limit for limit, _ in self.thresholds]
+        return np.select(conds, [green for _, green in self.thresholds], self.default).tolist()
+
+    def to_dict(self):
+        return {"kind": self.kind, "weights": self.weights, "thresholds": self.thresholds,
+                "default": self.default}
+
+    @classmethod
+    def from_dict(cls, d):
+        p = cls(d.get("weights"), d.get("thresholds"))
+        p.default = d.get("default", DEFAULT_GREEN)
+        return p
+
+
+class QTablePolicy:
+    """Greedy Q-learning policy: current green + best delta for the discretized state."""
+
+    kind = "qtable"
+
+    def __init__(self, table, cnt_bounds, spd_bounds):
+        # table[dens_lvl][spd_lvl] -> delta seconds
+        self.table = table
+        self.cnt_bounds = cnt_bounds
+        self.spd_bounds = spd_bounds
+
+    def delta(self, vehicle_count, avg_speed):
+        d = _level(_normalize(vehicle_count, *self.cnt_bounds))
+        s = _level(_normalize(avg_speed, *self.spd_bounds))
+        return self.table[d][s]
+
+    def decide(self, rec):
+        green = rec["current_green"] or DEFAULT_GREEN
+        return max(green + self.delta(rec["vehicle_count"], rec["avg_speed"]), MIN_GREEN)
+
+    def to_dict(self):
+        return {"kind": self.kind, "table": self.table,
+                "cnt_bounds": list(self.cnt_bounds), "spd_bounds": list(self.spd_bounds)}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["table"], d["cnt_bounds"], d["spd_bounds"])
+
+    @classmethod
+    def from_policy_csv(cls, path, cnt_bounds, spd_bounds):
+        """Build from the --out_policy CSV written by qlearning_traffic_controller.py."""
+        table = [[0, 0, 0] for _ in range(3)]
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                table[int(row["dens_lvl"])][int(row["spd_lvl"])] = int(float(row["best_delta"]))
+        return cls(table, cnt_bounds, spd_bounds)
+
+
+# Membership breakpoints and rule base of fuzzy_traffic_controller.py
+FUZZY_SETS = {
+    "low": [0.0, 0.0, 0.4],
+    "med": [0.2, 0.5, 0.8],
+    "high": [0.6, 1.0, 1.0],
+}
+FUZZY_OUTPUTS = {"dec": -5.0, "keep": 0.0, "inc": 5.0}
+# (output, combine, [(density set, speed set), ...]); a rule fires with the max over
+# its terms, each term is min() or the product of the two memberships
+FUZZY_RULES = [
+    ["inc", "min", [["high", "low"]]],
+    ["inc", "min", [["high", "med"]]],
+    ["inc", "min", [["med", "low"]]],
+    ["keep", "min", [["med", "med"]]],
+    ["dec", "min", [["low", "high"]]],
+    ["keep", "prod", [["low", "med"], ["med", "high"]]],
+]
+
+
+def _tri(x, a, b, c):
+    # Same arithmetic as tri() in fuzzy_traffic_controller.py, on plain floats
+    return max(min((x - a) / (b - a + 1e-9), (c - x) / (c - b + 1e-9)), 0.0)
+
+
+class FuzzyPolicy:
+    """Fuzzy controller evaluated exactly from its serialized sets and rules."""
+
+    kind = "fuzzy"
+
+    def __init__(self, cnt_bounds, spd_bounds, sets=None, outputs=None, rules=None):
+        self.cnt_bounds = cnt_bounds
+        self.spd_bounds = spd_bounds
+        self.sets = sets or FUZZY_SETS
+        self.outputs = outputs or FUZZY_OUTPUTS
+        self.rules = rules or FUZZY_RULES
+
+    def controller(self, cnt_n, spd_n):
+        """Equivalent to fuzzy_controller(cnt_n, spd_n)."""
+        D = {k: _tri(cnt_n, *abc) for k, abc in self.sets.items()}
+        S = {k: _tri(spd_n, *abc) for k, abc in self.sets.items()}
+        num = 0.0
+        den = 0.0
+        for out, combine, terms in self.rules:
+            if combine == "min":
+                w = max(min(D[d], S[s]) for d, s in terms)
+            else:
+                w = max(D[d] * S[s] for d, s in terms)
+            num += self.outputs[out] * w
+            den += w
+        return num / (den + 1e-9)
+
+    def delta(self, vehicle_count, avg_speed):
+        cnt_n = _normalize(vehicle_count, *self.cnt_bounds)
+        spd_n = _normalize(avg_speed, *self.spd_bounds)
+        return min(max(self.controller(cnt_n, spd_n), -10.0), 10.0)
+
+    def decide(self, rec):
+        green = rec["current_green"] or DEFAULT_GREEN
+        return max(green + self.delta(rec["vehicle_count"], rec["avg_speed"]), MIN_GREEN)
+
+    def to_dict(self):
+        return {"kind": self.kind, "cnt_bounds": list(self.cnt_bounds),
+                "spd_bounds": list(self.spd_bounds), "sets": self.sets,
+                "outputs": self.outputs, "rules": self.rules}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["cnt_bounds"], d["spd_bounds"], d.get("sets"), d.get("outputs"), d.get("rules"))
+
+
+POLICIES = {p.kind: p for p in (ThresholdPolicy, QTablePolicy, FuzzyPolicy)}
+
+
+def load_policy(path):
+    with open(path) as f:
+        d = json.load(f)
+    try:
+        cls = POLICIES[d["kind"]]
+    except KeyError:
+        raise ValueError(f"Unknown policy kind in {path}: {d.get('kind')!r}")
+    return cls.from_dict(d)
+
+
+def save_policy(policy, path):
+    with open(path, "w") as f:
+        json.dump(policy.to_dict(), f, indent=1)
@@ -0,0 +1,228 @@
+"""
+Lightweight record reader for the edge runtime.
+
+Streams rows from a CSV file (the traffic.csv / *_signal_plan.csv layout) or a
+JSON-lines feed and normalizes them into plain dicts, without pandas. Per-vehicle
+SUMO rows can be folded into the per-intersection time bins that the Q-learning
+and fuzzy controllers work on.
+
+Threshold inputs are derived like one of the two simulator entry points:
+
+    simulator   -> simulator.py: column aliases, missing values are 0
+    traffic_sim -> traffic_sim.py: missing queue/density/occupancy are estimated
+                   from tl_state and tl_lanes_controlled (the raw SUMO layout)
+"""
+
+import csv
+import datetime
+import itertools
+import json
+import sys
+
+# Column aliases, same lookup order as TrafficSimulator.derive_metrics in simulator.py
+ALIASES = {
+    "queue": ("queue", "Queue", "QUEUE"),
+    "density": ("density", "Density", "DENSITY"),
+    "occupancy": ("occupancy", "Occupancy", "OCCUPANCY"),
+    "speed": ("spd", "speed", "Speed"),
+    "vehicle_count": ("vehicle_count", "count"),
+    "avg_speed": ("avg_speed",),
+    "current_green": ("current_green", "tl_phase_duration"),
+}
+TIMESTAMP_KEYS = ("dateandtime", "DateTime", "timestamp", "time_bin")
+DERIVATIONS = ("simulator", "traffic_sim")
+LANE_LENGTH = 100  # same placeholder as traffic_sim.py
+
+
+def _float_or_none(value):
+    # Missing, empty, unparsable and NaN values are all None (pd.isna() in the controllers)
+    if value is None or value == "":
+        return None
+    try:
+        x = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if x != x else x
+
+
+def _number(value):
+    # Same as _float_or_none, but missing becomes 0 like the pd.isna() checks in simulator.py
+    x = _float_or_none(value)
+    if x is None:
+        return 0
+    return int(x) if x.is_integer() else x
+
+
+def traffic_sim_metrics(raw):
+    """(queue, density, occupancy, speed) as TrafficSimulator.derive_metrics in traffic_sim.py."""
+    queue = _float_or_none(raw.get("queue"))
+    density = _float_or_none(raw.get("density"))
+    occupancy = _float_or_none(raw.get("occupancy"))
+    speed = _float_or_none(raw.get("spd"))
+
+    if queue is None:
+        queue = str(raw.get("tl_state") or "").count("r")
+    if density is None:
+        lanes = raw.get("tl_lanes_controlled")
+        vehicle_count = str(lanes).count(",") + 1 if lanes else 1
+        density = vehicle_count / LANE_LENGTH
+    if occupancy is None:
+        occupancy = density * 5 / LANE_LENGTH
+    if speed is None:
+        speed = _number(raw.get("speed"))
+
+    return queue, density, occupancy, speed
+
+
+def normalize_record(raw, idx=0, derive="simulator"):
+    if derive not in DERIVATIONS:
+        raise ValueError(f"Unknown derivation {derive!r}, expected one of {DERIVATIONS}")
+    raw = {k.strip(): v for k, v in raw.items() if k is not None}
+    rec = {}
+    for field, keys in ALIASES.items():
+        rec[field] = _number(next((raw[k] for k in keys if k in raw), None))
+    if derive == "traffic_sim":
+        rec["queue"], rec["density"], rec["occupancy"], rec["speed"] = traffic_sim_metrics(raw)
+    rec["timestamp"] = next((raw[k] for k in TIMESTAMP_KEYS if raw.get(k)), f"Time_{idx}")
+    return rec
+
+
+def _raw_rows(f, fmt):
+    if fmt == "jsonl":
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        yield from csv.DictReader(f)
+
+
+def iter_rows(path, fmt=None):
+    """Yield raw rows (keys stripped) from path ("-" for stdin); fmt is "csv" or "jsonl"."""
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        for raw in _raw_rows(f, fmt):
+            yield {k.strip(): v for k, v in raw.items() if k is not None}
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def iter_records(path, fmt=None, derive="simulator"):
+    """Yield normalized records from path ("-" for stdin); fmt is "csv" or "jsonl"."""
+    for idx, raw in enumerate(iter_rows(path, fmt)):
+        yield normalize_record(raw, idx, derive)
+
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _parse_time(value):
+    # pd.to_datetime(errors="coerce") + dropna in preprocess(): unparsable rows are skipped
+    try:
+        dt = datetime.datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class _Bin:
+    def __init__(self):
+        self.vehicles = set()
+        self.spd_sum = 0.0
+        self.spd_n = 0
+        self.green_sum = 0.0
+        self.green_n = 0
+
+    def add(self, raw):
+        vehid = raw.get("vehid")
+        if vehid not in (None, ""):
+            self.vehicles.add(vehid)
+        spd = _float_or_none(raw.get("spd"))
+        if spd is not None:
+            self.spd_sum += spd
+            self.spd_n += 1
+        green = _float_or_none(raw.get("tl_phase_duration"))
+        if green is not None:
+            self.green_sum += green
+            self.green_n += 1
+
+    def record(self, intersection_id, start):
+        # Same columns as aggregate(): nunique vehid, mean spd, mean tl_phase_duration,
+        # empty means -> 0, and a 0 green falls back to the 10s default
+        green = self.green_sum / self.green_n if self.green_n else 0
+        return {
+            "intersection_id": intersection_id,
+            "timestamp": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "vehicle_count": len(self.vehicles),
+            "avg_speed": self.spd_sum / self.spd_n if self.spd_n else 0,
+            "current_green": green or 10,
+        }
+
+
+def aggregate_rows(rows, bin_seconds=10):
+    """
+    Fold per-vehicle rows into one record per (intersection, time bin), like
+    preprocess() + aggregate() in the controllers. Rows are expected in time order,
+    as SUMO writes them; a bin is emitted once a row from a later bin arrives. Rows
+    that arrive after their bin was emitted are dropped (and counted on stderr) rather
+    than reopening the bin and deciding on it twice.
+    """
+    if bin_seconds <= 0:
+        raise ValueError(f"bin_seconds must be positive, got {bin_seconds}")
+    open_bins = {}
+    current = None
+    late = 0
+    for idx, raw in enumerate(rows):
+        dt = _parse_time(raw.get("dateandtime"))
+        if dt is None:
+            continue
+        secs = (dt - EPOCH) // datetime.timedelta(seconds=1)
+        start = EPOCH + datetime.timedelta(seconds=secs // bin_seconds * bin_seconds)
+        if current is not None and start < current:
+            late += 1
+            continue
+        if current is not None and start > current:
+            for key, b in open_bins.items():
+                yield b.record(key[0], key[1])
+            open_bins = {}
+        current = start
+        # df.get("nextTLS", df.get("edge", df.index)) picks the column, not per row
+        if "nextTLS" in raw:
+            intersection_id = str(raw["nextTLS"])
+        elif "edge" in raw:
+            intersection_id = str(raw["edge"])
+        else:
+            intersection_id = str(idx)
+        key = (intersection_id, start)
+        if key not in open_bins:
+            open_bins[key] = _Bin()
+        open_bins[key].add(raw)
+    for key, b in open_bins.items():
+        yield b.record(key[0], key[1])
+    if late:
+        print(f"Dropped {late} late rows for time bins already emitted", file=sys.stderr)
+
+
+def iter_states(path, fmt=None, bin_seconds=10):
+    """
+    Yield (vehicle_count, avg_speed, current_green) records for the qtable and fuzzy
+    policies: pre-aggregated rows are passed through, per-vehicle rows are binned.
+    """
+    rows = iter_rows(path, fmt)
+    first = next(rows, None)
+    if first is None:
+        return
+    if "vehicle_count" in first:
+        yield normalize_record(first, 0)
+        for idx, raw in enumerate(rows, start=1):
+            yield normalize_record(raw, idx)
+    elif "vehid" in first and "dateandtime" in first:
+        yield from aggregate_rows(itertools.chain([first], rows), bin_seconds)
+    else:
+        raise ValueError(f"{path}: qtable/fuzzy policies need per-vehicle rows "
+                         "(dateandtime, vehid, spd) or aggregated rows with vehicle_count")
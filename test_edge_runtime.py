@@ -0,0 +1,289 @@
+import csv
+import datetime
+import itertools
+import os
+import random
+
+import pytest
+
+from edge_runtime import (FuzzyPolicy, QTablePolicy, ThresholdPolicy, aggregate_rows, iter_records,
+                          iter_states, load_policy, normalize_record, save_policy)
+from edge_runtime.__main__ import plan_bounds, run
+from predictor import TrafficPredictor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+QLEARN_PLAN = os.path.join(ROOT, "qlearning_signal_plan.csv")
+FUZZY_PLAN = os.path.join(ROOT, "fuzzy_signal_plan.csv")
+
+# Bounds of vehicle_count / avg_speed over the shipped signal plans
+CNT_BOUNDS = [1, 3]
+SPD_BOUNDS = [0, 98.69]
+QTABLE = [[-5, -5, -5], [0, -5, 0], [0, -5, 0]]
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+# -------------------- Threshold policy --------------------
+def test_threshold_matches_predictor_on_grid():
+    policy = ThresholdPolicy()
+    grid = itertools.product(range(0, 31, 3), [0, 0.5, 2.5, 5, 7.5], [0, 10, 50], [0, 3.6, 20, 60])
+    for queue, density, occupancy, speed in grid:
+        expected = TrafficPredictor.predict_duration(queue, density, occupancy, speed)
+        assert policy.predict_duration(queue, density, occupancy, speed) == expected
+
+
+@pytest.mark.parametrize("density,expected", [(2.5, 10), (2.51, 20), (5, 20), (5.01, 30), (7.5, 30), (7.51, 40)])
+def test_threshold_boundaries(density, expected):
+    # score = 2 * density, so 2.5 / 5 / 7.5 land exactly on the 5 / 10 / 15 thresholds
+    assert TrafficPredictor.predict_duration(0, density, 0, 0) == expected
+    assert ThresholdPolicy().predict_duration(0, density, 0, 0) == expected
+
+
+def test_threshold_batch_matches_scalar():
+    rng = random.Random(0)
+    metrics = [[rng.uniform(0, 30) for _ in range(50)], [rng.uniform(0, 8) for _ in range(50)],
+               [rng.uniform(0, 100) for _ in range(50)], [rng.uniform(0, 80) for _ in range(50)]]
+    policy = ThresholdPolicy()
+    assert policy.predict_batch(*metrics) == [policy.predict_duration(*m) for m in zip(*metrics)]
+
+
+# -------------------- Record reader --------------------
+def test_normalize_record_alias_order():
+    rec = normalize_record({"Queue": "2", "QUEUE": "3", "density": "1.5", "DENSITY": "9",
+                            "Occupancy": "4", "spd": "12", "speed": "30", " dateandtime": "t0"})
+    assert rec["queue"] == 2
+    assert rec["density"] == 1.5
+    assert rec["occupancy"] == 4
+    assert rec["speed"] == 12
+    assert rec["timestamp"] == "t0"
+
+
+@pytest.mark.parametrize("value", ["", "nan", "NaN", None, "n/a"])
+def test_normalize_record_missing_is_zero(value):
+    rec = normalize_record({"queue": value, "speed": value}, idx=7)
+    assert rec["queue"] == 0
+    assert rec["speed"] == 0
+    assert rec["density"] == 0
+    assert rec["timestamp"] == "Time_7"
+
+
+def test_normalize_record_matches_simulator():
+    pd = pytest.importorskip("pandas")
+    from simulator import TrafficSimulator
+
+    sim = TrafficSimulator.__new__(TrafficSimulator)
+    raws = [
+        {"queue": 3, "Density": 0.4, "OCCUPANCY": 12, "speed": 40},
+        {"Queue": 5, "density": float("nan"), "Occupancy": 2, "spd": 7, "Speed": 99},
+        {"QUEUE": 1},
+    ]
+    for raw in raws:
+        rec = normalize_record(raw)
+        assert (rec["queue"], rec["density"], rec["occupancy"], rec["speed"]) == \
+            sim.derive_metrics(pd.Series(raw))
+
+
+def write_sumo_feed(path, n=120, seed=0, max_speed=20):
+    # Per-vehicle rows in the layout traffic_model_run.py writes, no queue/density/occupancy
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 9, 9, 0, 13, 0)
+    cols = ["dateandtime", "vehid", "coord", "gpscoord", "spd", "edge", "lane", "displacement",
+            "turnAngle", "nextTLS", "tflight", "tl_state", "tl_phase_duration",
+            "tl_lanes_controlled", "tl_program", "tl_next_switch"]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(cols)
+        for i in range(n):
+            lanes = tuple(f"lane{k}_0" for k in range(rng.randint(1, 12)))
+            timestamp = start + datetime.timedelta(seconds=i // 4)
+            w.writerow([timestamp.strftime("%Y-%m-%d %H:%M:%S"), f"veh{rng.randint(0, rng.randint(1, 25))}",
+                        [1.0, 2.0], [103.8, 1.3], round(rng.uniform(0, max_speed), 2), f"e{rng.randint(0, 2)}", "e0_0", 1.0,
+                        90.0, rng.choice(["A", "B"]), "TLS", "".join(rng.choice("rRgGy") for _ in range(rng.randint(4, 40))),
+                        rng.choice([10, 20, 30]), lanes, "prog", 12.0])
+
+
+def test_traffic_sim_derivation_fallbacks():
+    raw = {"tl_state": "rrGgyr", "tl_lanes_controlled": "('a_0', 'b_0', 'c_0')", "spd": "7.2"}
+    rec = normalize_record(raw, derive="traffic_sim")
+    assert (rec["queue"], rec["density"], rec["occupancy"], rec["speed"]) == (3, 0.03, 0.03 * 5 / 100, 7.2)
+    rec = normalize_record({"queue": "4", "density": "", "spd": ""}, derive="traffic_sim")
+    assert (rec["queue"], rec["density"], rec["occupancy"], rec["speed"]) == (4, 0.01, 0.01 * 5 / 100, 0)
+    with pytest.raises(ValueError):
+        normalize_record(raw, derive="main")
+
+
+def test_traffic_sim_derivation_matches_traffic_sim(tmp_path):
+    pd = pytest.importorskip("pandas")
+    import traffic_sim
+
+    path = str(tmp_path / "traffic.csv")
+    write_sumo_feed(path)
+    sim = traffic_sim.TrafficSimulator()
+    policy = ThresholdPolicy()
+    durations = set()
+    # Same row-by-row read as TrafficSimulator.run_simulation
+    for chunk, rec in zip(pd.read_csv(path, chunksize=1), iter_records(path, derive="traffic_sim")):
+        metrics = sim.derive_metrics(chunk.iloc[0])
+        assert (rec["queue"], rec["density"], rec["occupancy"], rec["speed"]) == tuple(float(m) for m in metrics)
+        assert policy.decide(rec) == sim.predict_duration(*metrics)
+        durations.add(policy.decide(rec))
+    assert len(durations) > 1
+
+
+# -------------------- Policy files --------------------
+@pytest.mark.parametrize("policy", [
+    ThresholdPolicy(),
+    QTablePolicy(QTABLE, CNT_BOUNDS, SPD_BOUNDS),
+    FuzzyPolicy(CNT_BOUNDS, SPD_BOUNDS),
+], ids=lambda p: p.kind)
+def test_policy_round_trip(policy, tmp_path):
+    path = str(tmp_path / "policy.json")
+    save_policy(policy, path)
+    loaded = load_policy(path)
+    assert type(loaded) is type(policy)
+    assert loaded.to_dict() == policy.to_dict()
+
+
+def test_load_policy_unknown_kind(tmp_path):
+    path = tmp_path / "policy.json"
+    path.write_text('{"kind": "neural"}')
+    with pytest.raises(ValueError):
+        load_policy(str(path))
+
+
+# -------------------- End to end against the controllers --------------------
+def controller_input(path):
+    pd = pytest.importorskip("pandas")
+    df = pd.read_csv(path)
+    # preprocess() bins with astype("int64") // 10**9, which assumes nanoseconds;
+    # pandas >= 3 parses to a coarser unit, so pin it before handing the frame over
+    df["dateandtime"] = pd.to_datetime(df["dateandtime"]).astype("datetime64[ns]")
+    return df
+
+
+def run_decisions(capsys, policy_path, input_path):
+    # (intersection, time bin) -> green seconds, parsed from the run output
+    run(policy_path, input_path)
+    out = {}
+    for line in capsys.readouterr().out.splitlines():
+        timestamp = line[1:line.index("]")]
+        green = float(line.split("Green light ")[1].split("s ")[0])
+        intersection = line.split("(intersection=")[1].split(",")[0]
+        assert (intersection, timestamp) not in out
+        out[(intersection, timestamp)] = green
+    return out
+
+
+def test_qtable_end_to_end(tmp_path, capsys):
+    feed = str(tmp_path / "traffic.csv")
+    write_sumo_feed(feed, n=480, seed=1, max_speed=60)
+    q = pytest.importorskip("qlearning_traffic_controller")
+
+    # Same steps as qlearning_traffic_controller.main
+    grp = q.compute_congestion(q.aggregate(q.preprocess(controller_input(feed))))
+    Q, policy_df, _ = q.train_qlearning(grp, passes=5)
+    plan = q.apply_policy_to_group(grp, Q)
+    plan_csv, policy_csv = str(tmp_path / "plan.csv"), str(tmp_path / "policy.csv")
+    plan.to_csv(plan_csv, index=False)
+    policy_df.to_csv(policy_csv, index=False)
+
+    policy_path = str(tmp_path / "qtable.json")
+    save_policy(QTablePolicy.from_policy_csv(policy_csv, *plan_bounds(plan_csv)), policy_path)
+    decisions = run_decisions(capsys, policy_path, feed)
+
+    expected = {(row["intersection_id"], str(row["time_bin"])): row["suggested_green_qlearn"]
+                for _, row in plan.iterrows()}
+    assert len(expected) > 10
+    assert decisions == pytest.approx(expected)
+
+
+def test_fuzzy_end_to_end(tmp_path, capsys):
+    feed = str(tmp_path / "traffic.csv")
+    write_sumo_feed(feed, n=480, seed=2, max_speed=60)
+    f = pytest.importorskip("fuzzy_traffic_controller")
+
+    # Same steps as fuzzy_traffic_controller.main
+    plan = f.compute_congestion_and_apply_fuzzy(f.aggregate(f.preprocess(controller_input(feed))))
+    plan_csv = str(tmp_path / "plan.csv")
+    plan.to_csv(plan_csv, index=False)
+
+    policy_path = str(tmp_path / "fuzzy.json")
+    save_policy(FuzzyPolicy(*plan_bounds(plan_csv)), policy_path)
+    decisions = run_decisions(capsys, policy_path, feed)
+
+    expected = {(row["intersection_id"], str(row["time_bin"])): row["suggested_green_fuzzy"]
+                for _, row in plan.iterrows()}
+    assert len(expected) > 10
+    assert decisions == pytest.approx(expected)
+
+
+# -------------------- Fuzzy policy --------------------
+def test_fuzzy_matches_controller():
+    fuzzy = pytest.importorskip("fuzzy_traffic_controller")
+    policy = FuzzyPolicy([0, 1], [0, 1])
+    rng = random.Random(0)
+    points = [(rng.random(), rng.random()) for _ in range(5000)]
+    points += [(i / 20, j / 20) for i in range(21) for j in range(21)]
+    points += [(0.2005, 0.117), (0.2, 0.8), (1 - 1e-10, 0.8)]
+    for c, s in points:
+        assert policy.controller(c, s) == float(fuzzy.fuzzy_controller(c, s))
+
+
+def test_fuzzy_reproduces_signal_plan():
+    policy = FuzzyPolicy(CNT_BOUNDS, SPD_BOUNDS)
+    for rec, row in zip(iter_records(FUZZY_PLAN), read_rows(FUZZY_PLAN)):
+        assert policy.decide(rec) == pytest.approx(float(row["suggested_green_fuzzy"]))
+
+
+# -------------------- Time-bin aggregation --------------------
+def test_aggregate_rows_bins_by_intersection_and_time():
+    rows = [
+        {"dateandtime": "2025-09-09 00:13:21", "vehid": "veh0", "spd": "10", "nextTLS": "A", "tl_phase_duration": "20"},
+        {"dateandtime": "2025-09-09 00:13:22", "vehid": "veh0", "spd": "20", "nextTLS": "A", "tl_phase_duration": ""},
+        {"dateandtime": "2025-09-09 00:13:25", "vehid": "veh1", "spd": "", "nextTLS": "A", "tl_phase_duration": "30"},
+        {"dateandtime": "2025-09-09 00:13:29", "vehid": "veh2", "spd": "6", "nextTLS": "B", "tl_phase_duration": "0"},
+        {"dateandtime": "not a time", "vehid": "veh9", "spd": "99", "nextTLS": "A", "tl_phase_duration": "5"},
+        {"dateandtime": "2025-09-09 00:13:30", "vehid": "veh3", "spd": "8", "nextTLS": "A", "tl_phase_duration": ""},
+    ]
+    out = list(aggregate_rows(rows, bin_seconds=10))
+    assert out == [
+        {"intersection_id": "A", "timestamp": "2025-09-09 00:13:20",
+         "vehicle_count": 2, "avg_speed": 15.0, "current_green": 25.0},
+        {"intersection_id": "B", "timestamp": "2025-09-09 00:13:20",
+         "vehicle_count": 1, "avg_speed": 6.0, "current_green": 10},
+        {"intersection_id": "A", "timestamp": "2025-09-09 00:13:30",
+         "vehicle_count": 1, "avg_speed": 8.0, "current_green": 10},
+    ]
+
+
+def test_iter_states_rejects_rows_without_state(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text('{"queue": 3, "spd": 10}\n')
+    with pytest.raises(ValueError, match="vehicle_count"):
+        list(iter_states(str(path)))
+
+
+@pytest.mark.parametrize("bin_seconds", [0, -10])
+def test_aggregate_rows_rejects_non_positive_bin(bin_seconds):
+    with pytest.raises(ValueError, match="bin_seconds"):
+        list(aggregate_rows([], bin_seconds=bin_seconds))
+
+
+def test_aggregate_rows_drops_late_rows(capsys):
+    rows = [
+        {"dateandtime": "2025-09-09 00:13:21", "vehid": "veh0", "spd": "10", "nextTLS": "A"},
+        {"dateandtime": "2025-09-09 00:13:31", "vehid": "veh1", "spd": "20", "nextTLS": "A"},
+        # Late for the 00:13:20 bins, which were emitted when the 00:13:31 row arrived
+        {"dateandtime": "2025-09-09 00:13:28", "vehid": "veh2", "spd": "30", "nextTLS": "A"},
+        {"dateandtime": "2025-09-09 00:13:29", "vehid": "veh3", "spd": "40", "nextTLS": "B"},
+        {"dateandtime": "2025-09-09 00:13:35", "vehid": "veh4", "spd": "50", "nextTLS": "A"},
+    ]
+    out = list(aggregate_rows(rows, bin_seconds=10))
+    assert [(r["intersection_id"], r["timestamp"], r["vehicle_count"]) for r in out] == [
+        ("A", "2025-09-09 00:13:20", 1),
+        ("A", "2025-09-09 00:13:30", 2),
+    ]
+    assert "Dropped 2 late rows" in capsys.readouterr().err